@@ -0,0 +1,121 @@
+import os
+import signal
+import multiprocessing
+from collections import deque
+import pygame
+
+
+class FrameCapture:
+    """
+    La classe FrameCapture gère les captures d'écran du jeu sans bloquer la boucle de jeu.
+    Les frames sont copiées en mémoire sous forme d'octets (pygame.image.tobytes, une simple copie des pixels), puis l'encodage JPEG
+    et l'écriture sur le disque sont faits par un processus en arrière-plan. Un thread ne suffit pas : pygame.image.save garde le GIL
+    pendant tout l'encodage, et la boucle de jeu attendrait. Si le processus prend du retard et que max_pending envois attendent déjà,
+    les frames sont abandonnées plutôt que de faire attendre le jeu. La capture d'écran de la mort, elle, n'est jamais abandonnée.
+
+    Attributs :
+        ring (collections.deque) : Les dernières frames de la partie en cours (buffer circulaire de replay_seconds * fps frames).
+        record_dir (str) : Le dossier où enregistrer toutes les frames de chaque partie, ou None.
+        replay_dir (str) : Le dossier où enregistrer les dernières frames avant la mort.
+        screenshot_file (str) : Le fichier de la capture d'écran prise à la mort d'un serpent.
+        jobs (multiprocessing.Queue) : La file d'attente des images à encoder, lue par le processus d'encodage.
+        pending (multiprocessing.Value) : Le nombre d'envois pas encore traités par le processus d'encodage.
+        max_pending (int) : Le nombre d'envois en attente au-delà duquel les frames sont abandonnées.
+        dropped (int) : Le nombre de frames abandonnées dans la partie en cours parce que la file d'attente était pleine.
+        game (int) : Le numéro de la partie en cours.
+        tick (int) : Le numéro de la frame en cours dans la partie.
+        worker (multiprocessing.Process) : Le processus d'encodage.
+
+    Méthodes :
+        start_game() : Vide le buffer pour une nouvelle partie.
+        capture_frame(screen) : Copie la frame affichée dans le buffer et, si besoin, l'envoie à l'enregistrement.
+        screenshot(screen) : Enregistre la frame actuelle et les dernières frames du buffer, en arrière-plan.
+        end_game() : Affiche le nombre de frames abandonnées pendant la partie.
+        close() : Attend la fin des enregistrements en cours et arrête le processus d'encodage.
+    """
+    # Le format des pixels de l'écran (32 bits) : tobytes est alors une simple copie, sans conversion
+    FORMAT = "RGBX"
+
+    def __init__(self, fps, replay_seconds=0, record_dir=None, replay_dir="captures", screenshot_file="dernierInstant.jpg", max_pending=64):
+        self.ring = deque(maxlen=max(0, int(replay_seconds * fps)))
+        self.record_dir = record_dir
+        self.replay_dir = replay_dir
+        self.screenshot_file = screenshot_file
+        # Le processus est créé par "spawn" et non par fork : le processus du jeu a déjà pygame initialisé
+        context = multiprocessing.get_context("spawn")
+        # La file n'est pas bornée : c'est _submit qui abandonne les frames, pour que la capture de la mort passe toujours
+        self.jobs = context.Queue()
+        self.pending = context.Value('i', 0)
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.game = 0
+        self.tick = 0
+        self.worker = context.Process(target=FrameCapture._work, args=(self.jobs, self.pending), daemon=True)
+        self.worker.start()
+
+    def start_game(self):
+        self.ring.clear()
+        self.game += 1
+        self.tick = 0
+        self.dropped = 0
+
+    def end_game(self):
+        if self.dropped:
+            print(f"Capture partie {self.game}: {self.dropped} frames abandonnées (enregistrement trop lent)")
+
+    def capture_frame(self, screen):
+        self.tick += 1
+        if self.ring.maxlen == 0 and self.record_dir is None:
+            return
+        frame = (pygame.image.tobytes(screen, FrameCapture.FORMAT), screen.get_size())
+        # Le deque borné remplace la frame la plus ancienne quand il est plein
+        self.ring.append(frame)
+        if self.record_dir is not None:
+            path = os.path.join(self.record_dir, f"partie_{self.game:03d}", f"frame_{self.tick:05d}.jpg")
+            self._submit([(frame, path)])
+
+    # À appeler après capture_frame, pour que le buffer contienne la frame de la mort
+    def screenshot(self, screen):
+        death_frame = (pygame.image.tobytes(screen, FrameCapture.FORMAT), screen.get_size())
+        self._submit([(death_frame, self.screenshot_file)], droppable=False)
+        images = [(frame, os.path.join(self.replay_dir, f"partie_{self.game:03d}", f"frame_{i:04d}.jpg")) for i, frame in enumerate(self.ring)]
+        if images:
+            self._submit(images)
+
+    def close(self):
+        if self.worker.is_alive():
+            # Le None signale au processus de s'arrêter une fois la file d'attente vidée
+            self.jobs.put(None)
+            self.worker.join()
+        if self.worker.exitcode != 0:
+            # Le processus d'encodage a été tué (par un signal par exemple) : personne ne lira les images restantes,
+            # on n'attend donc pas qu'elles soient envoyées pour quitter
+            self.jobs.cancel_join_thread()
+
+    def _submit(self, images, droppable=True):
+        if droppable and self.pending.value >= self.max_pending:
+            self.dropped += len(images)
+            return
+        with self.pending.get_lock():
+            self.pending.value += 1
+        self.jobs.put(images)
+
+    # Exécutée dans le processus d'encodage
+    @staticmethod
+    def _work(jobs, pending):
+        # Un Ctrl+C est reçu aussi par ce processus : c'est le jeu qui s'arrête, puis appelle close() pour finir les enregistrements
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        while True:
+            images = jobs.get()
+            if images is None:
+                break
+            for (data, size), path in images:
+                try:
+                    directory = os.path.dirname(path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    pygame.image.save(pygame.image.frombytes(data, size, FrameCapture.FORMAT), path)
+                except (OSError, pygame.error) as e:
+                    print(f"Capture impossible de {path} : {e}")
+            with pending.get_lock():
+                pending.value -= 1
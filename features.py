@@ -0,0 +1,211 @@
+import math
+import numpy as np
+from collections import deque
+
+
+class Features:
+    """
+    La classe Features calcule les primitives utilisées par les fonctions d'évaluation (position de la tête, distance à la nourriture,
+    distance à l'autre serpent, distance au mur, mouvements possibles, ...).
+    Dans la recherche, chaque état n'est évalué qu'une fois : mémoriser une primitive ne sert que si plusieurs primitives du même état
+    en ont besoin. C'est le cas des cases voisines de la tête (neighbours), dont dépendent possible_moves, num_possible_moves et blocked_cells :
+    elles sont vérifiées au plus une fois par State et mémorisées dans state.features, que State vide dès que l'état est modifié.
+    Les autres primitives sont calculées directement.
+
+    Attributs :
+    NAMES (tuple) : Les noms des primitives numériques, utilisables dans weighted() et depuis la ligne de commande.
+    CACHED (frozenset) : Les noms des primitives mémorisées sur le State.
+    DIRECTIONS (tuple) : Les mouvements (nom, dx, dy), dans l'ordre de Snake.getPossibleMoves.
+
+    Méthodes :
+    get(state, snakeId, name) : Retourne la primitive name pour le serpent spécifié, en la calculant si besoin.
+    weighted(weights) : Crée une fonction d'évaluation qui est la somme pondérée des primitives de weights.
+    parse_weights(text) : Lit des poids de la forme "distance_to_food=-0.04,taille=100".
+    head, neighbours, possible_moves, taille, distance_to_food, ... : Le calcul de chaque primitive.
+    """
+    NAMES = (
+        'taille',
+        'distance_to_food',
+        'euclidean_distance_to_food',
+        'distance_to_other_head',
+        'distance_to_other_body',
+        'distance_to_wall',
+        'distance_to_center',
+        'num_possible_moves',
+        'moving_towards_food',
+        'compactness',
+        'chain_compactness',
+        'blocked_cells',
+        'free_space',
+        'food_reachable',
+    )
+    CACHED = frozenset(('neighbours',))
+    DIRECTIONS = (('up', 0, -1), ('down', 0, 1), ('left', -1, 0), ('right', 1, 0))
+
+    @staticmethod
+    def get(state, snakeId, name):
+        if name not in Features.CACHED:
+            return getattr(Features, name)(state, snakeId)
+        key = (snakeId, name)
+        if key not in state.features:
+            state.features[key] = getattr(Features, name)(state, snakeId)
+        return state.features[key]
+
+    @staticmethod
+    def weighted(weights):
+        return WeightedEvaluation(weights)
+
+    @staticmethod
+    def parse_weights(text):
+        weights = {}
+        for item in text.split(','):
+            name, _, weight = item.partition('=')
+            name = name.strip()
+            if name not in Features.NAMES:
+                raise ValueError(f"Primitive inconnue : {name}. Options possibles : {', '.join(Features.NAMES)}")
+            weights[name] = float(weight)
+        return weights
+
+    @staticmethod
+    def head(state, snakeId):
+        snake = state.snakes[snakeId]
+        return snake.posX[snake.head], snake.posY[snake.head]
+
+    # Pour chaque direction de DIRECTIONS, est-ce que la case voisine de la tête est libre ?
+    @staticmethod
+    def neighbours(state, snakeId):
+        snake = state.snakes[snakeId]
+        head_x, head_y = Features.head(state, snakeId)
+        return tuple(state.is_valid_position((head_x + dx * snake.grid_size, head_y + dy * snake.grid_size), snake) for _, dx, dy in Features.DIRECTIONS)
+
+    # Mêmes mouvements que Snake.getPossibleMoves : une case voisine libre, sans faire demi-tour
+    @staticmethod
+    def possible_moves(state, snakeId):
+        snake = state.snakes[snakeId]
+        neighbours = Features.get(state, snakeId, 'neighbours')
+        return tuple(move for (move, dx, dy), free in zip(Features.DIRECTIONS, neighbours) if free and (snake.vx, snake.vy) != (-dx, -dy))
+
+    @staticmethod
+    def taille(state, snakeId):
+        return state.snakes[snakeId].taille
+
+    # Distance de Manhattan
+    @staticmethod
+    def distance_to_food(state, snakeId):
+        head_x, head_y = Features.head(state, snakeId)
+        return abs(head_x - state.food[0]) + abs(head_y - state.food[1])
+
+    @staticmethod
+    def euclidean_distance_to_food(state, snakeId):
+        head_x, head_y = Features.head(state, snakeId)
+        return math.sqrt((head_x - state.food[0])**2 + (head_y - state.food[1])**2)
+
+    # Distance de Manhattan entre les deux têtes
+    @staticmethod
+    def distance_to_other_head(state, snakeId):
+        head_x, head_y = Features.head(state, snakeId)
+        other_x, other_y = Features.head(state, (snakeId + 1) % len(state.snakes))
+        return abs(head_x - other_x) + abs(head_y - other_y)
+
+    # Distance de Manhattan minimale entre la tête et le corps de l'autre serpent
+    @staticmethod
+    def distance_to_other_body(state, snakeId):
+        head_x, head_y = Features.head(state, snakeId)
+        other_snake = state.snakes[(snakeId + 1) % len(state.snakes)]
+        return min(abs(head_x - x) + abs(head_y - y) for x, y in zip(other_snake.posX, other_snake.posY))
+
+    @staticmethod
+    def distance_to_wall(state, snakeId):
+        return state.getDistanceToWall(snakeId)
+
+    # Distance de Manhattan au centre de l'écran
+    @staticmethod
+    def distance_to_center(state, snakeId):
+        head_x, head_y = Features.head(state, snakeId)
+        return abs(head_x - state.screen.get_width() // 2) + abs(head_y - state.screen.get_height() // 2)
+
+    @staticmethod
+    def num_possible_moves(state, snakeId):
+        return len(Features.possible_moves(state, snakeId))
+
+    # Est-ce que le serpent se déplace vers la nourriture ?
+    @staticmethod
+    def moving_towards_food(state, snakeId):
+        snake = state.snakes[snakeId]
+        head_x, head_y = Features.head(state, snakeId)
+        direction_to_food = (np.sign(state.food[0] - head_x), np.sign(state.food[1] - head_y))
+        return direction_to_food == (snake.vx, snake.vy)
+
+    # Inverse de la somme des distances entre toutes les paires de segments
+    @staticmethod
+    def compactness(state, snakeId):
+        snake = state.snakes[snakeId]
+        compactness_rate = 0
+        for i in range(len(snake.posX)):
+            for j in range(i + 1, len(snake.posX)):
+                compactness_rate += abs(snake.posX[i] - snake.posX[j]) + abs(snake.posY[i] - snake.posY[j])
+        return 1 / compactness_rate if compactness_rate != 0 else 0
+
+    # Somme des distances entre segments consécutifs dans posX et posY. Plus elle est faible, plus le serpent est compact
+    @staticmethod
+    def chain_compactness(state, snakeId):
+        snake = state.snakes[snakeId]
+        compactness = 0
+        for i in range(len(snake.posX) - 1):
+            compactness += abs(snake.posX[i] - snake.posX[i+1]) + abs(snake.posY[i] - snake.posY[i+1])
+        return compactness
+
+    # Nombre de cases bloquées autour de la tête du serpent
+    @staticmethod
+    def blocked_cells(state, snakeId):
+        return Features.get(state, snakeId, 'neighbours').count(False)
+
+    # Espace libre sur une grille de 7x7 cellules centrée sur la tête du serpent (voir Minimax.evaluate_survivalist)
+    @staticmethod
+    def free_space(state, snakeId):
+        snake = state.snakes[snakeId]
+        head_x, head_y = Features.head(state, snakeId)
+        free_space = 0
+        for dx in range(max(0, head_x - 3 * 25), min(state.screen.get_width(), head_x + 4 * 25), 25):
+            for dy in range(max(0, head_y - 3 * 25), min(state.screen.get_height(), head_y + 4 * 25), 25):
+                x, y = head_x + dx, head_y + dy
+                if state.is_valid_position((x, y), snake):
+                    free_space += 1
+        return free_space
+
+    # Existe-t-il un chemin jusqu'à la nourriture ? Recherche en largeur (BFS)
+    @staticmethod
+    def food_reachable(state, snakeId):
+        snake = state.snakes[snakeId]
+        head_x, head_y = Features.head(state, snakeId)
+        food_x, food_y = state.food
+
+        queue = deque([(head_x, head_y)])
+        visited = set([(head_x, head_y)])
+        while queue:
+            x, y = queue.popleft()
+            if x == food_x and y == food_y:
+                return True
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                nx, ny = x + dx * 25, y + dy * 25
+                if state.is_valid_position((nx, ny), snake) and (nx, ny) not in zip(snake.posX, snake.posY) and (nx, ny) not in visited:
+                    queue.append((nx, ny))
+                    visited.add((nx, ny))
+        return False
+
+
+class WeightedEvaluation:
+    """
+    La classe WeightedEvaluation est une fonction d'évaluation définie comme une somme pondérée de primitives de Features.
+    C'est une classe plutôt qu'une fonction locale pour pouvoir être envoyée aux processus de travail (pickle).
+
+    Attributs :
+    weights (dict) : Le poids de chaque primitive.
+    __name__ (str) : Le nom affiché au lancement du jeu, comme celui des autres fonctions d'évaluation.
+    """
+    def __init__(self, weights):
+        self.weights = weights
+        self.__name__ = "weighted(" + ", ".join(f"{name}={weight}" for name, weight in weights.items()) + ")"
+
+    def __call__(self, state, snakeId):
+        return sum(weight * Features.get(state, snakeId, name) for name, weight in self.weights.items())
@@ -2,7 +2,12 @@ from state import State
 import pygame
 import snake
 import random
+import time
+import signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from minimax import Minimax
+from capture import FrameCapture
 
 
 class GameWithAi():
@@ -17,19 +22,26 @@ class GameWithAi():
         grid_size (int) : La taille de la grille pour le jeu.
         state (State) : L'état actuel du jeu.
         clock (pygame.time.Clock) : L'horloge pour contrôler le temps dans le jeu.
+        telemetry (Telemetry) : Les mesures de latence de chaque tour, ou None pour les désactiver.
+        capture (FrameCapture) : Les captures d'écran, enregistrées en arrière-plan pour ne pas bloquer le jeu.
+        executor (ProcessPoolExecutor) : Les processus qui cherchent le coup de chaque serpent en parallèle, ou None pour jouer les serpents l'un après l'autre.
 
     Méthodes :
+        init_worker() : Prépare un processus de recherche à son lancement.
         initialize_game(self) : Initialise une nouvelle partie du jeu.
         update_state(self, use_a_star=False) : Met à jour l'état du jeu en déplaçant les serpents.
+        update_state_simultaneous(self) : Met à jour l'état du jeu en cherchant les coups des serpents en parallèle, puis en les déplaçant en même temps.
+        play_simultaneous(self, moves) : Déplace tous les serpents en même temps, fait grandir ceux qui sont sur la nourriture et replace la nourriture.
+        check_game_over(self) : Vérifie si la partie est terminée, avec les règles du mode de jeu choisi.
         run_game(self) : Lance le jeu.
-        screenshot(self, state) : Prend une capture d'écran de l'état actuel du jeu. Utile pour comprendre comment le serpent est mort.
+        screenshot(self, state) : Prend une capture d'écran de l'état actuel du jeu (et des dernières frames si demandé). Utile pour comprendre comment le serpent est mort.
         refresh_window(self) : Rafraîchit la fenêtre du jeu.
         draw_grid(self) : Dessine la grille du jeu.
         draw_food(self) : Dessine la nourriture sur la grille du jeu.
         generate_food(self) : Génère une nouvelle position de nourriture sur la grille.
     """
     
-    def __init__(self,depth,evaluate_functions,screen,fps=10,grid_size=25):
+    def __init__(self,depth,evaluate_functions,screen,fps=10,grid_size=25,telemetry=None,capture=None,parallel=False):
         # Attributs pygame
         self.grid_size = grid_size
         self.screen = screen
@@ -40,6 +52,22 @@ class GameWithAi():
         self.depth = depth
         self.evaluate_functions = evaluate_functions
         self.state = None
+        self.telemetry = telemetry
+        self.capture = capture if capture is not None else FrameCapture(fps)
+        # Les processus sont créés par "spawn" et non par fork : le processus du jeu a déjà des threads (la file de FrameCapture) et pygame initialisé
+        self.executor = None
+        if parallel:
+            # Chaque processus importe minimax (et donc pygame et numpy) dès son lancement (voir init_worker), et on les lance tout de suite :
+            # sinon le premier tour de la première partie attendrait ces imports (plus d'une demi-seconde)
+            self.executor = ProcessPoolExecutor(max_workers=self.num_snakes, mp_context=multiprocessing.get_context("spawn"), initializer=GameWithAi.init_worker)
+            for future in [self.executor.submit(int) for _ in range(self.num_snakes)]:
+                future.result()
+
+    # Pour exécuter init_worker, le processus importe gameWithAi, donc aussi minimax, pygame et numpy.
+    # Un Ctrl+C est reçu aussi par les processus de recherche : c'est le jeu qui s'arrête, puis les arrête avec executor.shutdown()
+    @staticmethod
+    def init_worker():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
 
     def initialize_game(self):
         food = self.generate_food()
@@ -57,13 +85,19 @@ class GameWithAi():
                 break  # Sinon, on break la boucle
 
         self.state = State(snakes, food,self.screen)
+        self.capture.start_game()
+        if self.telemetry is not None:
+            self.telemetry.start_game()
     
     def update_state(self):
         # Prochaine valeur de la nourriture
         next_food = self.state.generate_food(self.screen)
         # Pour chaque serpent, on calcule le meilleur mouvement à l'aide de Minimax
         for i, snake in enumerate(self.state.snakes):
-            _, bestMove = Minimax.minmax(self.state, i,self.depth,float('-inf'),float('inf'),True,self.evaluate_functions[i],next_food)
+            start = time.perf_counter_ns()
+            _, bestMove = Minimax.search(self.state, i,self.depth,self.evaluate_functions[i],next_food)
+            if self.telemetry is not None:
+                self.telemetry.record_decision(i, time.perf_counter_ns() - start)
             # On déplace le serpent en fonction du meilleur mouvement et on met à jour l'état du jeu
             snake.move(bestMove)
             self.state.update_snake(i, snake)
@@ -71,39 +105,102 @@ class GameWithAi():
             if self.state.on_food(i):
                 self.state.update_food(next_food)
                 next_food = self.state.generate_food(self.screen)
+
+    def update_state_simultaneous(self):
+        # La prochaine nourriture ne sert que d'indication pour la recherche : la vraie est tirée après les déplacements (voir play_simultaneous)
+        next_food = self.state.generate_food(self.screen)
+        # Les deux recherches partent du même instantané, chacune dans son processus
+        snapshot = self.state.snapshot()
+        futures = [self.executor.submit(Minimax.search_snapshot, snapshot, i, self.depth, self.evaluate_functions[i], next_food) for i in range(len(self.state.snakes))]
+        moves = []
+        for i, future in enumerate(futures):
+            # La durée de chaque recherche est mesurée dans son processus
+            move, duration = future.result()
+            moves.append(move)
+            if self.telemetry is not None:
+                self.telemetry.record_decision(i, duration)
+        self.play_simultaneous(moves)
+
+    # Les collisions sont vérifiées ensuite par simultaneous_game_over
+    def play_simultaneous(self, moves):
+        for i, snake in enumerate(self.state.snakes):
+            snake.move(moves[i])
+            self.state.update_snake(i, snake)
+        # Tous les serpents arrivés sur la nourriture la mangent : avec update_food, seul le premier de la liste grandirait
+        eaters = [i for i in range(len(self.state.snakes)) if self.state.on_food(i)]
+        for i in eaters:
+            self.state.snakes[i].extend()
+            self.state.update_snake(i, self.state.snakes[i])
+        # La nourriture est tirée après les déplacements : tirée avant, elle pourrait tomber sous la nouvelle tête d'un serpent
+        if eaters:
+            self.state.food = self.state.generate_food(self.screen)
+
+    def check_game_over(self):
+        if self.executor is not None:
+            return self.state.simultaneous_game_over()
+        return self.state.game_over()
             
             
     def run_game(self):
         print(f"Snake 0 (bleu) avec {self.evaluate_functions[0].__name__}, Snake 1 (vert) avec {self.evaluate_functions[1].__name__}")
         # Cette boucle permet de relancer automatiquement le jeu après qu'un serpent soit mort
         game_running = True
-        while game_running:
-            self.initialize_game()
-
-            # La boucle d'une partie
-            running = True
-            while running and not self.state.game_over()[0]:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                        game_running = False
+        try:
+            while game_running:
+                self.initialize_game()
+
+                # La boucle d'une partie
+                running = True
+                game_over, cause, id = False, None, None
+                while running and not self.check_game_over()[0]:
+                    tick_start = time.perf_counter_ns()
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            running = False
+                            game_running = False
+                    events_end = time.perf_counter_ns()
                 
-                self.update_state()
-
-                game_over, cause,id = self.state.game_over()
-                if game_over:
-                    print(f"Game over: Snake n°{id} die to {cause}, Highscore: {max([snake.taille for snake in self.state.snakes])}")
-                    # Une fois mort, on prend une capture d'écran pour pouvoir analyser
-                    self.screenshot(self.state)
-                    running = False
-
-                # On refresh la fenêtre du jeu
-                self.refresh_window()
-                # Clock tick controle la vitesse du jeu
-                self.clock.tick(self.fps)
+                    if self.executor is not None:
+                        self.update_state_simultaneous()
+                    else:
+                        self.update_state()
+
+                    game_over, cause,id = self.check_game_over()
+                    if game_over:
+                        print(f"Game over: Snake n°{id} die to {cause}, Highscore: {max([snake.taille for snake in self.state.snakes])}")
+                        running = False
+
+                    # On refresh la fenêtre du jeu
+                    render_start = time.perf_counter_ns()
+                    self.refresh_window()
+                    capture_start = time.perf_counter_ns()
+                    self.capture.capture_frame(self.screen)
+                    if game_over:
+                        # Une fois mort, on prend une capture d'écran pour pouvoir analyser.
+                        # On la prend après le rendu pour que la frame de la mort soit dans la capture et dans le replay
+                        self.screenshot(self.state)
+                    # On mesure le tour avant clock.tick, qui attend la fin du budget de 1/fps
+                    if self.telemetry is not None:
+                        tick_end = time.perf_counter_ns()
+                        self.telemetry.record_events(events_end - tick_start)
+                        self.telemetry.record_render(capture_start - render_start)
+                        self.telemetry.record_capture(tick_end - capture_start)
+                        self.telemetry.record_tick(tick_end - tick_start)
+                    # Clock tick controle la vitesse du jeu
+                    self.clock.tick(self.fps)
+
+                self.capture.end_game()
+                if self.telemetry is not None:
+                    self.telemetry.end_game(cause, id, max([snake.taille for snake in self.state.snakes]))
+        finally:
+            # On attend la fin des captures en cours avant de quitter, même si la partie s'est arrêtée sur une exception
+            self.capture.close()
+            if self.executor is not None:
+                self.executor.shutdown()
         
+    # L'encodage et l'écriture sur le disque se font en arrière-plan (voir FrameCapture)
     def screenshot(self,state):
-        pygame.image.save(state.screen, "dernierInstant.jpg")
+        self.capture.screenshot(state.screen)
 
     def refresh_window(self):
         self.draw_grid()
@@ -5,6 +5,9 @@ import pygame
 import cProfile
 import pstats
 from minimax import Minimax
+from telemetry import Telemetry
+from features import Features
+from capture import FrameCapture
 
 def main():
     evaluate_functions = {
@@ -36,10 +39,22 @@ def main():
     parser.add_argument('--grid_size', type=int, default=25, help='Taille de la grille pour le jeu. Ne pas modifier pour l\'instant.')
     parser.add_argument('--profile', action='store_true', help='Activer le profiler')
     parser.add_argument('--fps', type=int, default=10, help='Vitesse du jeu')
+    parser.add_argument('--parallel', action='store_true', help='Chercher le coup des deux serpents en parallèle (un processus par serpent), puis les déplacer en même temps')
+    parser.add_argument('--replay_seconds', type=float, default=0, help='Nombre de secondes avant la mort à enregistrer image par image dans captures/ (en plus de dernierInstant.jpg)')
+    parser.add_argument('--record', type=str, default=None, help='Dossier où enregistrer toutes les frames de chaque partie')
+    parser.add_argument('--telemetry', action='store_true', help='Afficher à chaque fin de partie les latences (p50/p95/p99) et le nombre de tours hors budget 1/fps')
+    parser.add_argument('--telemetry_file', type=str, default=None, help='Fichier JSON où ajouter les latences de chaque partie (une ligne par partie)')
     parser.add_argument('--eval_func', type=int, default=2, help=eval_func_help)
     parser.add_argument('--eval_func_2', type=int, default=2, help=eval_func_help_bis)
+    weights_help = "Fonction d'évaluation du snake {} définie comme une somme pondérée de primitives, par exemple \"taille=100,distance_to_food=-0.04\". Remplace --eval_func{}. Primitives possibles :\n" + ", ".join(Features.NAMES)
+    parser.add_argument('--weights', type=str, default=None, help=weights_help.format(0, ''))
+    parser.add_argument('--weights_2', type=str, default=None, help=weights_help.format(1, '_2'))
     
     args = parser.parse_args()
+    try:
+        weights = [Features.parse_weights(w) if w else None for w in (args.weights, args.weights_2)]
+    except ValueError as e:
+        parser.error(str(e))
     
     pygame.init()
     pygame.display.set_caption('IA RUMBLE INSnAke')
@@ -49,7 +64,14 @@ def main():
     0: evaluate_functions[args.eval_func],
     1: evaluate_functions[args.eval_func_2],
     } 
-    SnakeGame = gameWithAi.GameWithAi(args.depth, evaluate_functions, screen, args.fps,args.grid_size)
+    for i, w in enumerate(weights):
+        if w is not None:
+            evaluate_functions[i] = Features.weighted(w)
+    telemetry = None
+    if args.telemetry or args.telemetry_file:
+        telemetry = Telemetry(args.fps, output_file=args.telemetry_file, verbose=args.telemetry)
+    capture = FrameCapture(args.fps, args.replay_seconds, args.record)
+    SnakeGame = gameWithAi.GameWithAi(args.depth, evaluate_functions, screen, args.fps,args.grid_size,telemetry,capture,args.parallel)
     
     if args.profile:
         profiler = cProfile.Profile()
@@ -2,7 +2,10 @@
 import numpy as np
 import math
 import random
+import time
 from collections import deque
+from features import Features
+from state import State
 
 class Minimax:
     """
@@ -15,6 +18,26 @@ class Minimax:
         l'ID du serpent, la profondeur de recherche maximale, les valeurs alpha et beta pour l'élagage, 
         un booléen indiquant si le joueur actuel est le joueur maximisant, la fonction d'évaluation à utiliser, et la position de la prochaine nourriture.
         Elle retourne la meilleure valeur que le joueur actuel peut obtenir et le meilleur mouvement que le joueur actuel peut faire.
+
+    search(state, snakeId, depth, evaluate, next_food) :
+        Point d'entrée de la recherche pour un serpent. Si les deux serpents sont séparés (leurs régions accessibles sont disjointes
+        et ne se partagent pas la nourriture), chaque serpent est cherché seul avec solo, sinon on utilise minmax.
+
+    search_snapshot(snapshot, snakeId, depth, evaluate, next_food) :
+        Pareil que search, mais à partir d'un instantané de State (voir State.snapshot). Utilisée par les processus de travail
+        pour chercher le coup des deux serpents en parallèle. Elle retourne le meilleur mouvement et la durée de la recherche (en nanosecondes),
+        mesurée dans le processus de travail.
+
+    get_regions(state, horizon) :
+        Calcule par remplissage (flood fill) la région accessible depuis la tête de chaque serpent. Les segments libérés par la queue
+        dans les 'horizon' prochains coups sont considérés comme libres.
+
+    is_separated(state, regions, next_food) :
+        Vérifie si les régions des serpents sont disjointes et si la nourriture (actuelle et prochaine) n'est accessible que par un seul serpent.
+
+    solo(state, snakeId, depth, evaluate, next_food, cache) :
+        Recherche à un seul joueur (le serpent spécifié, l'autre serpent ne pouvant plus interagir avec lui). Elle favorise la survie la plus longue
+        puis la fonction d'évaluation, et met en cache les positions déjà évaluées.
     
     evaluate_simple(state, snakeId) :
         Cette méthode calcule une évaluation simple de l'état du jeu pour le serpent spécifié. Elle prend en compte la distance de Manhattan 
@@ -80,6 +103,106 @@ class Minimax:
                 if beta <= alpha:
                     break
             return bestValue, bestMove
+
+    # Valeur d'une mort dans solo. On retire la profondeur restante pour favoriser la survie la plus longue.
+    DEATH = 1e9
+
+    @staticmethod
+    def search(state, snakeId, depth, evaluate, next_food):
+        # depth compte les coups des deux serpents : chaque serpent ne joue que (depth + 1) // 2 coups pendant la recherche
+        regions = Minimax.get_regions(state, (depth + 1) // 2)
+        if Minimax.is_separated(state, regions, next_food):
+            # Les serpents ne peuvent pas interagir pendant l'horizon de recherche : au lieu d'entrelacer les coups des deux serpents
+            # (coût multiplicatif), on cherche uniquement les coups du serpent courant (coût additif). Il joue un coup sur deux dans minmax.
+            return Minimax.solo(state, snakeId, (depth + 1) // 2, evaluate, next_food, {})
+        return Minimax.minmax(state, snakeId, depth, float('-inf'), float('inf'), True, evaluate, next_food)
+
+    @staticmethod
+    def search_snapshot(snapshot, snakeId, depth, evaluate, next_food):
+        start = time.perf_counter_ns()
+        _, bestMove = Minimax.search(State.from_snapshot(snapshot), snakeId, depth, evaluate, next_food)
+        return bestMove, time.perf_counter_ns() - start
+
+    @staticmethod
+    def get_regions(state, horizon):
+        grid_size = state.snakes[0].grid_size
+        width, height = state.screen.get_width(), state.screen.get_height()
+
+        # La queue est à l'index head+1 du buffer circulaire : le k-ième segment depuis la queue est libéré après k+1 coups.
+        # Les segments libérés avant la fin de l'horizon sont considérés comme libres.
+        blocked = set()
+        for snake in state.snakes:
+            length = len(snake.posX)
+            for k in range(horizon, length):
+                i = (snake.head + 1 + k) % length
+                blocked.add((snake.posX[i], snake.posY[i]))
+
+        regions = []
+        for snake in state.snakes:
+            head = (snake.posX[snake.head], snake.posY[snake.head])
+            queue = deque([head])
+            region = set([head])
+            while queue:
+                x, y = queue.popleft()
+                for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                    nx, ny = x + dx * grid_size, y + dy * grid_size
+                    if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in blocked and (nx, ny) not in region:
+                        queue.append((nx, ny))
+                        region.add((nx, ny))
+            regions.append(region)
+        return regions
+
+    @staticmethod
+    def is_separated(state, regions, next_food):
+        if state.game_over()[0]:
+            return False
+        grid_size = state.snakes[0].grid_size
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                if not regions[i].isdisjoint(regions[j]):
+                    return False
+                # Deux têtes côte à côte peuvent encore se percuter
+                (xi, yi), (xj, yj) = [(s.posX[s.head], s.posY[s.head]) for s in (state.snakes[i], state.snakes[j])]
+                if abs(xi - xj) + abs(yi - yj) <= grid_size:
+                    return False
+        # Si un serpent mange, la nourriture suivante apparaît : elle ne doit pas être dans la région d'un autre serpent
+        reaching = set(i for i, region in enumerate(regions) for food in (state.food, next_food) if food in region)
+        return len(reaching) <= 1
+
+    @staticmethod
+    def solo(state, snakeId, depth, evaluate, next_food, cache):
+        snake = state.snakes[snakeId]
+        if snake.is_dead(state)[0]:
+            return -Minimax.DEATH - depth, None
+        if depth == 0:
+            return evaluate(state, snakeId), None
+
+        # Le corps est lu depuis la tête, pour que deux chemins menant à la même position partagent la même entrée du cache.
+        # On garde aussi l'index de la tête : is_self_collision et getPossibleMoves dépendent de la position dans le buffer circulaire
+        # (l'index taille-1 n'est pas vérifié), donc deux buffers rangés différemment peuvent donner des morts différentes
+        length = len(snake.posX)
+        body = tuple((snake.posX[(snake.head - k) % length], snake.posY[(snake.head - k) % length]) for k in range(length))
+        key = (body, snake.head, snake.vx, snake.vy, state.food, depth)
+        if key in cache:
+            return cache[key]
+
+        actions = snake.getPossibleMoves(state)
+        if not actions:
+            # Aucun mouvement possible : le serpent meurt au prochain coup
+            return -Minimax.DEATH - depth, None
+        random.shuffle(actions)
+        bestValue = -float('inf')
+        bestMove = None
+        for action in actions:
+            newState = state.clone()
+            newState.snakes[snakeId].move(action)
+            newState.update_food(next_food)
+            eval, _ = Minimax.solo(newState, snakeId, depth - 1, evaluate, next_food, cache)
+            if eval > bestValue:
+                bestValue = eval
+                bestMove = action
+        cache[key] = (bestValue, bestMove)
+        return bestValue, bestMove
         
     # @staticmethod. Cela signifie que la méthode appartient à la classe Minimax, 
     # mais ne nécessite pas une instance de cette classe pour être appelée
@@ -122,11 +245,7 @@ class Minimax:
         distance_to_other_snake = abs(snake.posX[snake.head] - other_snake.posX[other_snake.head]) + abs(snake.posY[snake.head] - other_snake.posY[other_snake.head])
 
         # Compactness
-        compactness_rate = 0
-        for i in range(len(snake.posX)):
-            for j in range(i + 1, len(snake.posX)):
-                compactness_rate += abs(snake.posX[i] - snake.posX[j]) + abs(snake.posY[i] - snake.posY[j])
-        compactness_rate = 1 / compactness_rate if compactness_rate != 0 else 0
+        compactness_rate = Features.compactness(state, snake_id)
 
         # Bonus si le serpent peut tuer l'autre serpent au prochain tour
         can_kill_other_snake = distance_to_other_snake == 1
@@ -159,15 +278,8 @@ class Minimax:
         head_x, head_y = snake.posX[snake.head], snake.posY[snake.head]
 
         # On regarde le nombre de cases bloquées autour de la tête du serpent.
-        # Gridsize = 25
-        blocked_cells = 0
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            x, y = head_x + dx * 25, head_y + dy * 25
-            if not state.is_valid_position((x, y),snake):
-                blocked_cells += 1
-
         # On pénalise si beaucoup de cases sont bloquées
-        penalty = blocked_cells * 100
+        penalty = Features.blocked_cells(state, snakeId) * 100
 
         # Le calcul de l'espace libre autour de la tête du serpent est effectué 
         # en parcourant une grille de 7x7 cellules centrée sur la tête du serpent 
@@ -177,30 +289,15 @@ class Minimax:
         # et si elle n'est pas occupée par le corps du serpent. 
         # Si ces deux conditions sont remplies, la cellule est considérée comme un espace libre 
         # et le compteur free_space est incrémenté.
-        free_space = 0
-        for dx in range(max(0, head_x - 3 * 25), min(state.screen.get_width(), head_x + 4 * 25), 25):
-            for dy in range(max(0, head_y - 3 * 25), min(state.screen.get_height(), head_y + 4 * 25), 25):
-                x, y = head_x + dx, head_y + dy
-                if state.is_valid_position((x, y),snake):
-                    free_space += 1
-
         # On favorise les états avec plus d'espace libre
-        bonus = free_space * 10 
+        bonus = Features.free_space(state, snakeId) * 10 
 
         # On calcule la distance minimale à l'autre snake
-        other_snake_id = 1 - snakeId # 1 ou 0
-        other_snake = state.snakes[other_snake_id]
-        min_distance_to_snake = float('inf')
-        for x, y in zip(other_snake.posX, other_snake.posY):
-            distance = abs(head_x - x) + abs(head_y - y)
-            min_distance_to_snake = min(min_distance_to_snake, distance)
-
         # On favorise les états avec une plus grande distance à l'autre serpent
-        distance_bonus = min_distance_to_snake * 5
+        distance_bonus = Features.distance_to_other_body(state, snakeId) * 5
 
         # Le nombre de mouvements possibles pour le serpent
-        possible_moves = len(snake.getPossibleMoves(state))
-        moves_bonus = possible_moves * 20
+        moves_bonus = Features.num_possible_moves(state, snakeId) * 20
 
         # Calcul de la distance à la nourriture
         food_x, food_y = state.food
@@ -262,34 +359,9 @@ class Minimax:
 
     
     def evaluate_path_to_food(state, snake_id):
-        snake = state.snakes[snake_id]
-        head_x, head_y = snake.posX[snake.head], snake.posY[snake.head]
-        food_x, food_y = state.food
-
-        # On initialise la file pour notre algorithme de recherche en largeur (BFS)
-        # et notre ensemble de cellules visitées
-        queue = deque([(head_x, head_y)])
-        visited = set([(head_x, head_y)])
-
-        while queue:
-            x, y = queue.popleft()
-
+        # Recherche en largeur (BFS) du chemin jusqu'à la nourriture (voir Features.food_reachable)
+        if Features.food_reachable(state, snake_id):
             # Si on atteint la nourriture, on retourne positif
-            if x == food_x and y == food_y:
-                return 1000+Minimax.evaluate_distance(state,snake_id)
-
-            # On ajoute les voisins valides et non visités à la file
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = x + dx * 25, y + dy * 25
-                if state.is_valid_position((nx, ny),snake) and (nx, ny) not in zip(snake.posX, snake.posY) and (nx, ny) not in visited:
-                    queue.append((nx, ny))
-                    visited.add((nx, ny))
-
+            return 1000+Minimax.evaluate_distance(state,snake_id)
         # Si on ne trouve pas de chemin jusqu'à la nourriture, on retourne valeur négative
         return -1000+Minimax.evaluate_distance(state,snake_id)
-
-   
-    
-
-
-    
@@ -1,6 +1,7 @@
 import copy
 import math
 import random
+from snake import Snake
 
 class State:
     """
@@ -10,6 +11,7 @@ class State:
     snakes (list) : Une liste de tous les serpents dans le jeu.
     food (tuple) : La position actuelle de la nourriture sur la grille.
     screen (pygame.Surface) : L'écran de jeu.
+    features (dict) : Les primitives déjà calculées pour cet état (voir Features). Vidé à chaque modification de l'état.
 
     Méthodes :
     update_snake(index, new_snake) : Met à jour le serpent à l'index spécifié.
@@ -26,15 +28,21 @@ class State:
     is_self_collision(pos, snake) : Vérifie si le serpent spécifié se heurte à lui-même à la position spécifiée.
     is_snake_collision(pos, snake) : Vérifie si le serpent spécifié se heurte à un autre serpent à la position spécifiée.
     game_over() : Vérifie si le jeu est terminé.
+    simultaneous_game_over() : Vérifie si le jeu est terminé quand les serpents ont bougé en même temps (collision tête contre tête comprise).
+    is_head_to_head(snake, other_snake) : Vérifie si les têtes des deux serpents sont sur la même case ou viennent d'échanger leurs cases.
     clone() : Crée une copie indépendante de l'état actuel.
+    snapshot() : Retourne un instantané immuable de l'état (tuples d'entiers), peu coûteux à envoyer à un autre processus.
+    from_snapshot(snapshot) : Reconstruit un State à partir d'un instantané.
     """
     def __init__(self, snakes, food, screen):
         self.snakes = snakes  
         self.food = food
         self.screen = screen
+        self.features = {}
 
     def update_snake(self, index, new_snake):
         self.snakes[index] = new_snake
+        self.features = {}
 
     def update_food(self, new_food):
         self.food = new_food
@@ -62,7 +70,9 @@ class State:
     def getPossibleMoves(self, snakeId):
         return self.snakes[snakeId].getPossibleMoves()
 
+    # Appelée après chaque déplacement, dans le jeu comme dans la recherche : on invalide aussi les primitives mémorisées
     def update_food(self,new_food):
+        self.features = {}
         for snake in self.snakes:
             if (snake.posX[snake.head], snake.posY[snake.head]) == self.food:
                 snake.extend()
@@ -120,6 +130,57 @@ class State:
                 return True,cause,id
         return False,None,None
 
+    # Quand les serpents bougent en même temps, la mort de chaque serpent est calculée après tous les déplacements.
+    # Deux têtes sur la même case, ou qui échangent leurs cases (chaque tête sur le cou de l'autre), sont une collision
+    # tête contre tête : le plus petit serpent meurt, les deux en cas d'égalité.
+    # Si plusieurs serpents meurent, c'est un match nul et l'id retourné est None.
+    def simultaneous_game_over(self):
+        causes = {}
+        for i, snake in enumerate(self.snakes):
+            head = (snake.posX[snake.head], snake.posY[snake.head])
+            if self.is_wall_collision(head, self.screen):
+                causes[i] = "wall"
+            elif self.is_self_collision(head, snake):
+                causes[i] = "self"
+
+        head_to_head = set()
+        for i in range(len(self.snakes)):
+            for j in range(i + 1, len(self.snakes)):
+                snake, other_snake = self.snakes[i], self.snakes[j]
+                if self.is_head_to_head(snake, other_snake):
+                    head_to_head.add((i, j))
+                    if snake.taille <= other_snake.taille:
+                        causes.setdefault(i, "head_to_head")
+                    if other_snake.taille <= snake.taille:
+                        causes.setdefault(j, "head_to_head")
+
+        for i, snake in enumerate(self.snakes):
+            if i in causes:
+                continue
+            head = (snake.posX[snake.head], snake.posY[snake.head])
+            for j, other_snake in enumerate(self.snakes):
+                # La collision avec l'autre serpent a déjà été réglée par la règle tête contre tête
+                if j != i and (min(i, j), max(i, j)) not in head_to_head and head in zip(other_snake.posX, other_snake.posY):
+                    causes[i] = "other_snake"
+                    break
+
+        if not causes:
+            return False,None,None
+        if len(causes) == 1:
+            (i, cause), = causes.items()
+            return True,cause,self.snakes[i].id
+        return True,"+".join(dict.fromkeys(causes[i] for i in sorted(causes))),None
+
+    def is_head_to_head(self, snake, other_snake):
+        head = (snake.posX[snake.head], snake.posY[snake.head])
+        other_head = (other_snake.posX[other_snake.head], other_snake.posY[other_snake.head])
+        if head == other_head:
+            return True
+        # Le cou est la position précédente de la tête dans le buffer circulaire
+        neck = (snake.posX[snake.head - 1], snake.posY[snake.head - 1])
+        other_neck = (other_snake.posX[other_snake.head - 1], other_snake.posY[other_snake.head - 1])
+        return head == other_neck and other_head == neck
+
     # deepcopy permet d'avoir un nouveau State complètement indépendant du premier
     # def clone(self):
     #     new_snakes = copy.deepcopy(self.snakes)
@@ -130,4 +191,45 @@ class State:
     def clone(self):
         new_snakes = [snake.copy() for snake in self.snakes]
         return State(new_snakes, self.food, self.screen)
+
+    # L'écran pygame ne peut pas être envoyé à un autre processus : l'instantané ne garde que ses dimensions
+    def snapshot(self):
+        snakes = tuple((snake.id, snake.grid_size, tuple(snake.posX), tuple(snake.posY), snake.head, snake.vx, snake.vy, snake.taille) for snake in self.snakes)
+        return (self.screen.get_width(), self.screen.get_height(), self.food, snakes)
+
+    @staticmethod
+    def from_snapshot(snapshot):
+        width, height, food, snakes = snapshot
+        board = Board(width, height)
+        new_snakes = []
+        for id, grid_size, posX, posY, head, vx, vy, taille in snakes:
+            new_snake = Snake(id, board, grid_size)
+            new_snake.posX = list(posX)
+            new_snake.posY = list(posY)
+            new_snake.head = head
+            new_snake.vx = vx
+            new_snake.vy = vy
+            new_snake.taille = taille
+            new_snakes.append(new_snake)
+        return State(new_snakes, food, board)
+
+
+class Board:
+    """
+    La classe Board remplace l'écran pygame dans les états reconstruits par State.from_snapshot.
+    La recherche et les fonctions d'évaluation n'utilisent que les dimensions de l'écran.
+
+    Méthodes :
+    get_width() : Retourne la largeur du plateau.
+    get_height() : Retourne la hauteur du plateau.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
     
\ No newline at end of file
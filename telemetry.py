@@ -0,0 +1,180 @@
+import json
+import math
+
+
+class LatencyHistogram:
+    """
+    La classe LatencyHistogram est un histogramme de latences à taille fixe, sur le principe des histogrammes HDR :
+    les valeurs sont rangées dans des tranches log-linéaires (2^sub_bucket_bits sous-tranches par puissance de 2),
+    ce qui donne une précision relative constante (~3% par défaut) avec une mémoire bornée, quel que soit le nombre de valeurs.
+
+    Attributs :
+        max_value (int) : La plus grande valeur représentable (en microsecondes). Les valeurs au-dessus sont ramenées à max_value.
+        sub_bucket_count (int) : Le nombre de sous-tranches par puissance de 2.
+        counts (list) : Le nombre de valeurs dans chaque tranche.
+        total (int) : Le nombre total de valeurs enregistrées.
+        max (int) : La plus grande valeur enregistrée.
+        sum (int) : La somme des valeurs enregistrées.
+
+    Méthodes :
+        record(value) : Enregistre une valeur.
+        percentile(q) : Retourne la valeur du percentile q (entre 0 et 100).
+        summary() : Retourne un résumé (nombre, moyenne, p50, p95, p99, max) en millisecondes.
+        reset() : Remet l'histogramme à zéro.
+    """
+    def __init__(self, max_value=60_000_000, sub_bucket_bits=5):
+        self.max_value = max_value
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.max = 0
+        self.sum = 0
+
+    # Les petites valeurs ont chacune leur tranche, au-delà on garde les bits de poids fort
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_count.bit_length() + 1
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (value >> shift) - self.half_count
+
+    # Milieu de la tranche, pour ne pas biaiser les percentiles vers le bas
+    def _value(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        sub_bucket = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return (sub_bucket << shift) + (1 << (shift - 1))
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(q / 100 * self.total))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def summary(self):
+        # Les valeurs sont en microsecondes, le résumé en millisecondes
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum / self.total / 1000, 3) if self.total else 0,
+            "p50_ms": self.percentile(50) / 1000,
+            "p95_ms": self.percentile(95) / 1000,
+            "p99_ms": self.percentile(99) / 1000,
+            "max_ms": self.max / 1000,
+        }
+
+
+class Telemetry:
+    """
+    La classe Telemetry mesure la latence de chaque tour de jeu de GameWithAi : le temps de décision de chaque serpent,
+    le temps de rendu (dessin et affichage de la fenêtre), le temps de capture des frames (copie et envoi à FrameCapture),
+    le temps de la boucle d'événements pygame, et le temps total du tour.
+    Elle compte aussi les tours qui dépassent le budget de 1/fps secondes imposé par clock.tick(fps).
+    À la fin de chaque partie, un résumé (p50/p95/p99) est affiché et/ou ajouté au fichier JSON (une ligne par partie).
+
+    Attributs :
+        fps (int) : Les frames par seconde visées, qui fixent le budget d'un tour.
+        budget (float) : Le budget d'un tour en microsecondes (infini si fps <= 0).
+        output_file (str) : Le fichier où ajouter le résumé de chaque partie, ou None.
+        verbose (bool) : Si True, le résumé de chaque partie est affiché dans la console.
+        decisions (list) : Un LatencyHistogram des temps de décision par serpent.
+        render (LatencyHistogram) : Les temps de rendu.
+        capture (LatencyHistogram) : Les temps de capture des frames, capture d'écran de la mort comprise.
+        events (LatencyHistogram) : Les temps de la boucle d'événements.
+        ticks (LatencyHistogram) : Les temps totaux des tours.
+        overruns (int) : Le nombre de tours qui ont dépassé le budget.
+        game (int) : Le numéro de la partie en cours.
+
+    Méthodes :
+        start_game() : Remet les mesures à zéro pour une nouvelle partie.
+        record_decision(snakeId, duration) : Enregistre le temps de décision d'un serpent (en nanosecondes).
+        record_render(duration) : Enregistre le temps de rendu (en nanosecondes).
+        record_capture(duration) : Enregistre le temps de capture des frames (en nanosecondes).
+        record_events(duration) : Enregistre le temps de la boucle d'événements (en nanosecondes).
+        record_tick(duration) : Enregistre le temps total d'un tour (en nanosecondes) et compte les dépassements.
+        summary() : Retourne le résumé de la partie en cours.
+        end_game(cause=None, snakeId=None, highscore=None) : Affiche et/ou écrit le résumé de la partie.
+    """
+    def __init__(self, fps, num_snakes=2, output_file=None, verbose=True):
+        self.fps = fps
+        self.budget = 1_000_000 / fps if fps > 0 else float('inf')
+        self.output_file = output_file
+        self.verbose = verbose
+        self.decisions = [LatencyHistogram() for _ in range(num_snakes)]
+        self.render = LatencyHistogram()
+        self.capture = LatencyHistogram()
+        self.events = LatencyHistogram()
+        self.ticks = LatencyHistogram()
+        self.overruns = 0
+        self.game = 0
+
+    def start_game(self):
+        for histogram in self.decisions + [self.render, self.capture, self.events, self.ticks]:
+            histogram.reset()
+        self.overruns = 0
+        self.game += 1
+
+    # Les durées sont mesurées avec time.perf_counter_ns() et stockées en microsecondes
+    def record_decision(self, snakeId, duration):
+        self.decisions[snakeId].record(duration // 1000)
+
+    def record_render(self, duration):
+        self.render.record(duration // 1000)
+
+    def record_capture(self, duration):
+        self.capture.record(duration // 1000)
+
+    def record_events(self, duration):
+        self.events.record(duration // 1000)
+
+    def record_tick(self, duration):
+        self.ticks.record(duration // 1000)
+        if duration / 1000 > self.budget:
+            self.overruns += 1
+
+    def summary(self):
+        return {
+            "game": self.game,
+            "fps": self.fps,
+            "budget_ms": round(self.budget / 1000, 3) if self.fps > 0 else None,
+            "overruns": self.overruns,
+            "tick": self.ticks.summary(),
+            "decision": {str(i): histogram.summary() for i, histogram in enumerate(self.decisions)},
+            "render": self.render.summary(),
+            "capture": self.capture.summary(),
+            "events": self.events.summary(),
+        }
+
+    def end_game(self, cause=None, snakeId=None, highscore=None):
+        summary = self.summary()
+        summary.update({"cause": cause, "snake": snakeId, "highscore": highscore})
+        if self.verbose:
+            tick = summary["tick"]
+            print(f"Telemetry partie {self.game}: {tick['count']} tours, {self.overruns} hors budget ({summary['budget_ms']} ms), "
+                  f"tour p50/p95/p99 = {tick['p50_ms']}/{tick['p95_ms']}/{tick['p99_ms']} ms")
+            for i, decision in summary["decision"].items():
+                print(f"  Snake {i} décision p50/p95/p99 = {decision['p50_ms']}/{decision['p95_ms']}/{decision['p99_ms']} ms")
+            render, capture, events = summary["render"], summary["capture"], summary["events"]
+            print(f"  Rendu p50/p95/p99 = {render['p50_ms']}/{render['p95_ms']}/{render['p99_ms']} ms, "
+                  f"capture p50/p95/p99 = {capture['p50_ms']}/{capture['p95_ms']}/{capture['p99_ms']} ms, "
+                  f"événements p50/p95/p99 = {events['p50_ms']}/{events['p95_ms']}/{events['p99_ms']} ms")
+        if self.output_file is not None:
+            with open(self.output_file, "a") as f:
+                f.write(json.dumps(summary) + "\n")
+        return summary
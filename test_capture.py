@@ -0,0 +1,92 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from capture import FrameCapture
+
+
+def make_screen(color):
+    screen = pygame.Surface((50, 40))
+    screen.fill(color)
+    return screen
+
+
+def frame_color(frame):
+    data, size = frame
+    return pygame.image.frombytes(data, size, FrameCapture.FORMAT).get_at((0, 0))[:3]
+
+
+# Le JPEG n'est pas exact : on compare les couleurs à quelques unités près
+def assert_saved_color(path, color):
+    saved = pygame.image.load(str(path)).get_at((25, 20))[:3]
+    assert all(abs(a - b) <= 8 for a, b in zip(saved, color))
+
+
+@pytest.fixture
+def capture(tmp_path):
+    capture = FrameCapture(10, replay_seconds=0.5, replay_dir=str(tmp_path / "replay"), screenshot_file=str(tmp_path / "mort.jpg"), max_pending=4)
+    yield capture
+    if capture.worker.is_alive():
+        capture.close()
+
+
+def test_ring_keeps_last_frames(capture, tmp_path):
+    capture.start_game()
+    colors = [(i * 30, 0, 0) for i in range(8)]
+    for color in colors:
+        capture.capture_frame(make_screen(color))
+    # 0.5 s à 10 fps : les 5 dernières frames, de la plus ancienne à la plus récente
+    assert capture.ring.maxlen == 5
+    assert [frame_color(frame) for frame in capture.ring] == colors[3:]
+
+    capture.screenshot(make_screen(colors[-1]))
+    capture.close()
+    replay = tmp_path / "replay" / "partie_001"
+    assert sorted(os.listdir(replay)) == [f"frame_{i:04d}.jpg" for i in range(5)]
+    assert_saved_color(replay / "frame_0000.jpg", colors[3])
+    assert_saved_color(replay / "frame_0004.jpg", colors[-1])
+    assert_saved_color(tmp_path / "mort.jpg", colors[-1])
+
+
+def test_submit_drops_when_full(capture, tmp_path, capsys):
+    capture.record_dir = str(tmp_path / "record")
+    capture.start_game()
+    capture.capture_frame(make_screen((0, 0, 255)))
+    # On simule un processus d'encodage en retard
+    with capture.pending.get_lock():
+        capture.pending.value = capture.max_pending
+    capture.capture_frame(make_screen((0, 255, 0)))
+    assert capture.dropped == 1
+
+    capture.end_game()
+    assert "1 frames abandonnées" in capsys.readouterr().out
+    capture.close()
+    assert os.listdir(tmp_path / "record" / "partie_001") == ["frame_00001.jpg"]
+
+
+def test_death_screenshot_is_never_dropped(capture, tmp_path):
+    capture.start_game()
+    for i in range(3):
+        capture.capture_frame(make_screen((0, i * 50, 0)))
+    with capture.pending.get_lock():
+        capture.pending.value = capture.max_pending
+    capture.screenshot(make_screen((200, 100, 0)))
+    # Les frames du replay sont abandonnées, pas la capture d'écran de la mort
+    assert capture.dropped == 3
+    capture.close()
+    assert_saved_color(tmp_path / "mort.jpg", (200, 100, 0))
+    assert not (tmp_path / "replay").exists()
+
+
+def test_start_game_resets(capture):
+    capture.start_game()
+    capture.capture_frame(make_screen((1, 2, 3)))
+    capture.dropped = 2
+    capture.start_game()
+    assert len(capture.ring) == 0
+    assert capture.dropped == 0
+    assert capture.tick == 0
+    assert capture.game == 2
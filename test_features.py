@@ -0,0 +1,89 @@
+import pickle
+import random
+
+import pytest
+
+from features import Features, WeightedEvaluation
+from snake import Snake
+from state import State, Board
+
+GRID_SIZE = 25
+
+
+def random_states(count, seed=0):
+    rng = random.Random(seed)
+    board = Board(10 * GRID_SIZE, 8 * GRID_SIZE)
+    states = []
+    while len(states) < count:
+        snakes = [Snake(i, board, GRID_SIZE, rng.randint(2, 9) * GRID_SIZE, rng.randint(2, 7) * GRID_SIZE) for i in range(2)]
+        state = State(snakes, (rng.randint(0, 9) * GRID_SIZE, rng.randint(0, 7) * GRID_SIZE), board)
+        for _ in range(60):
+            if state.game_over()[0]:
+                break
+            states.append(state.clone())
+            for snake in state.snakes:
+                moves = snake.getPossibleMoves(state)
+                snake.move(rng.choice(moves) if moves else 'up')
+                state.update_food(state.generate_food(board))
+    return states
+
+
+def test_neighbour_primitives_match_direct_checks():
+    for state in random_states(500):
+        for snakeId, snake in enumerate(state.snakes):
+            head_x, head_y = Features.head(state, snakeId)
+            blocked = sum(not state.is_valid_position((head_x + dx * GRID_SIZE, head_y + dy * GRID_SIZE), snake)
+                          for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)])
+            assert Features.possible_moves(state, snakeId) == tuple(snake.getPossibleMoves(state))
+            assert Features.num_possible_moves(state, snakeId) == len(snake.getPossibleMoves(state))
+            assert Features.blocked_cells(state, snakeId) == blocked
+
+
+def test_only_neighbours_are_cached():
+    state = random_states(1)[0]
+    for name in Features.NAMES:
+        Features.get(state, 0, name)
+    assert set(state.features) == {(0, 'neighbours')}
+
+
+def test_update_snake_clears_cache():
+    state = random_states(1)[0]
+    Features.get(state, 0, 'neighbours')
+    snake = state.snakes[0]
+    snake.move(snake.getPossibleMoves(state)[0])
+    state.update_snake(0, snake)
+    assert state.features == {}
+    assert Features.possible_moves(state, 0) == tuple(snake.getPossibleMoves(state))
+
+
+def test_update_food_clears_cache():
+    state = random_states(1)[0]
+    Features.get(state, 1, 'neighbours')
+    snake = state.snakes[1]
+    snake.move(snake.getPossibleMoves(state)[0])
+    state.update_food(state.food)
+    assert state.features == {}
+    assert Features.blocked_cells(state, 1) == 4 - sum(Features.neighbours(state, 1))
+
+
+def test_parse_weights():
+    assert Features.parse_weights("taille=100, distance_to_food=-0.04") == {'taille': 100.0, 'distance_to_food': -0.04}
+
+
+@pytest.mark.parametrize("text", ["longueur=1", "taille=abc", "taille", "taille=1,,free_space=2", "neighbours=1"])
+def test_parse_weights_errors(text):
+    with pytest.raises(ValueError):
+        Features.parse_weights(text)
+
+
+def test_weighted_evaluation():
+    weights = {'taille': 100, 'distance_to_food': -0.04, 'free_space': 10, 'num_possible_moves': 20}
+    evaluate = Features.weighted(weights)
+    assert isinstance(evaluate, WeightedEvaluation)
+    assert evaluate.__name__ == "weighted(taille=100, distance_to_food=-0.04, free_space=10, num_possible_moves=20)"
+    # Les processus de travail reçoivent la fonction d'évaluation par pickle
+    evaluate = pickle.loads(pickle.dumps(evaluate))
+    for state in random_states(50, seed=1):
+        expected = (100 * Features.taille(state, 0) - 0.04 * Features.distance_to_food(state, 0)
+                    + 10 * Features.free_space(state, 0) + 20 * len(state.snakes[0].getPossibleMoves(state)))
+        assert evaluate(state, 0) == pytest.approx(expected)
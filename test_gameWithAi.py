@@ -0,0 +1,76 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+
+from capture import FrameCapture
+from gameWithAi import GameWithAi
+from minimax import Minimax
+from snake import Snake
+from state import State, Board
+
+GRID_SIZE = 25
+
+
+# cells va de la queue à la tête, en cases
+def make_snake(id, board, cells, velocity):
+    snake = Snake(id, board, GRID_SIZE)
+    snake.posX = [x * GRID_SIZE for x, y in cells]
+    snake.posY = [y * GRID_SIZE for x, y in cells]
+    snake.head = len(cells) - 1
+    snake.taille = len(cells)
+    snake.vx, snake.vy = velocity
+    return snake
+
+
+def cells(snake):
+    return set((x // GRID_SIZE, y // GRID_SIZE) for x, y in zip(snake.posX, snake.posY))
+
+
+@pytest.fixture
+def game():
+    # Un plateau d'une seule ligne de 8 cases
+    board = Board(8 * GRID_SIZE, GRID_SIZE)
+    capture = FrameCapture(0)
+    game = GameWithAi(2, {0: Minimax.evaluate_simple, 1: Minimax.evaluate_simple}, board, capture=capture)
+    yield game
+    capture.close()
+
+
+def test_food_respawns_after_moves(game):
+    for _ in range(50):
+        # Le snake 0 mange en (3, 0) pendant que le snake 1 avance en (4, 0). Avant les déplacements, (3, 0) et (4, 0) sont les
+        # seules cases libres ; après, ce sont (0, 0) et (7, 0), libérées par les queues
+        snakes = [make_snake(0, game.screen, [(0, 0), (1, 0), (2, 0)], (1, 0)), make_snake(1, game.screen, [(7, 0), (6, 0), (5, 0)], (-1, 0))]
+        game.state = State(snakes, (3 * GRID_SIZE, 0), game.screen)
+        game.play_simultaneous(['right', 'left'])
+
+        assert game.state.snakes[0].taille == 4
+        assert game.state.snakes[1].taille == 3
+        food = (game.state.food[0] // GRID_SIZE, game.state.food[1] // GRID_SIZE)
+        assert food in {(0, 0), (7, 0)}
+        assert all(food not in cells(snake) for snake in game.state.snakes)
+        assert game.state.simultaneous_game_over() == (False, None, None)
+
+
+def test_both_snakes_on_food_eat(game):
+    snakes = [make_snake(0, game.screen, [(0, 0), (1, 0), (2, 0)], (1, 0)), make_snake(1, game.screen, [(6, 0), (5, 0), (4, 0)], (-1, 0))]
+    game.state = State(snakes, (3 * GRID_SIZE, 0), game.screen)
+    game.play_simultaneous(['right', 'left'])
+    assert [snake.taille for snake in game.state.snakes] == [4, 4]
+    assert game.state.simultaneous_game_over() == (True, "head_to_head", None)
+
+
+class FailingGame(GameWithAi):
+    def update_state(self):
+        raise RuntimeError("recherche impossible")
+
+
+def test_run_game_closes_capture_on_error():
+    board = Board(8 * GRID_SIZE, 8 * GRID_SIZE)
+    capture = FrameCapture(0)
+    game = FailingGame(2, {0: Minimax.evaluate_simple, 1: Minimax.evaluate_simple}, board, capture=capture)
+    with pytest.raises(RuntimeError):
+        game.run_game()
+    assert not capture.worker.is_alive()
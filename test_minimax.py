@@ -0,0 +1,89 @@
+from minimax import Minimax
+from snake import Snake
+from state import State, Board
+
+GRID_SIZE = 25
+
+
+# cells va de la queue à la tête, en cases
+def make_snake(id, board, cells, velocity):
+    snake = Snake(id, board, GRID_SIZE)
+    snake.posX = [x * GRID_SIZE for x, y in cells]
+    snake.posY = [y * GRID_SIZE for x, y in cells]
+    snake.head = len(cells) - 1
+    snake.taille = len(cells)
+    snake.vx, snake.vy = velocity
+    return snake
+
+
+def cell(x, y):
+    return x * GRID_SIZE, y * GRID_SIZE
+
+
+def make_state(cells_0, velocity_0, cells_1, velocity_1, food):
+    board = Board(10 * GRID_SIZE, 10 * GRID_SIZE)
+    snakes = [make_snake(0, board, cells_0, velocity_0), make_snake(1, board, cells_1, velocity_1)]
+    return State(snakes, cell(*food), board)
+
+
+# Le corps du snake 0 ferme le coin en haut à gauche, où le snake 1 est enfermé. La queue du snake 0 est loin du mur.
+WALL = [(0, 5), (0, 4), (0, 3), (1, 3), (2, 3), (3, 3), (3, 2), (3, 1), (3, 0), (4, 0), (5, 0)]
+CORNERED = [(0, 0), (1, 0), (1, 1)]
+
+
+def separated(state, next_food, depth=2):
+    return Minimax.is_separated(state, Minimax.get_regions(state, (depth + 1) // 2), cell(*next_food))
+
+
+def test_walled_off_snakes_are_separated():
+    state = make_state(WALL, (1, 0), CORNERED, (0, 1), (8, 8))
+    assert separated(state, (9, 9))
+    # La nourriture et la suivante sont toutes les deux dans le coin : seul le snake 1 peut les atteindre
+    state = make_state(WALL, (1, 0), CORNERED, (0, 1), (2, 2))
+    assert separated(state, (0, 2))
+
+
+def test_wall_freed_within_horizon_is_not_separated():
+    # Sur 6 coups du snake 0, les segments de queue jusqu'à (0, 3) sont libérés et le coin s'ouvre
+    state = make_state(WALL, (1, 0), CORNERED, (0, 1), (8, 8))
+    assert not separated(state, (9, 9), depth=12)
+
+
+def test_adjacent_heads_are_not_separated():
+    # La tête du snake 1 est coincée dans l'angle, ses régions sont disjointes de celles du snake 0, mais les têtes se touchent
+    state = make_state([(3, 0), (2, 0), (1, 0)], (-1, 0), [(0, 2), (0, 1), (0, 0)], (0, -1), (8, 8))
+    regions = Minimax.get_regions(state, 1)
+    assert regions[0].isdisjoint(regions[1])
+    assert not separated(state, (9, 9))
+
+
+def test_food_reachable_by_both_is_not_separated():
+    state = make_state([(0, 0), (1, 0), (2, 0)], (1, 0), [(9, 9), (8, 9), (7, 9)], (-1, 0), (5, 5))
+    assert not separated(state, (9, 0))
+
+
+def test_next_food_in_other_region_is_not_separated():
+    state = make_state(WALL, (1, 0), CORNERED, (0, 1), (8, 8))
+    assert not separated(state, (2, 2))
+
+
+def test_solo_escapes_dead_end():
+    # Le snake 0 monte le long de son propre corps : à gauche, la case (0, 0) est un cul-de-sac (avec la nourriture),
+    # à droite, le plateau est libre
+    state = make_state([(2, 2), (1, 2), (0, 2), (0, 1), (1, 1), (1, 0)], (0, -1), [(9, 7), (9, 8), (9, 9)], (0, 1), (0, 0))
+    value, move = Minimax.solo(state, 0, 3, Minimax.evaluate_simple, cell(5, 5), {})
+    assert move == 'right'
+    assert value > -Minimax.DEATH
+    # Le cul-de-sac est bien mortel : en y allant, le serpent ne peut plus bouger
+    dead_end = state.clone()
+    dead_end.snakes[0].move('left')
+    dead_end.update_food(cell(5, 5))
+    assert Minimax.solo(dead_end, 0, 2, Minimax.evaluate_simple, cell(5, 5), {})[0] < -Minimax.DEATH
+
+
+def test_search_uses_solo_when_separated():
+    state = make_state(WALL, (1, 0), CORNERED, (0, 1), (8, 8))
+    value, move = Minimax.search(state, 1, 4, Minimax.evaluate_simple, cell(9, 9))
+    # Chaque serpent joue 2 des 4 coups de la recherche
+    assert value == Minimax.solo(state, 1, 2, Minimax.evaluate_simple, cell(9, 9), {})[0]
+    assert move in state.snakes[1].getPossibleMoves(state)
@@ -0,0 +1,50 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from snake import Snake
+from state import State
+
+GRID_SIZE = 25
+
+
+# cells va de la queue à la tête, en cases
+def make_snake(id, screen, cells, velocity):
+    snake = Snake(id, screen, GRID_SIZE)
+    snake.posX = [x * GRID_SIZE for x, y in cells]
+    snake.posY = [y * GRID_SIZE for x, y in cells]
+    snake.head = len(cells) - 1
+    snake.taille = len(cells)
+    snake.vx, snake.vy = velocity
+    return snake
+
+
+def play(cells_0, velocity_0, cells_1, velocity_1, moves):
+    screen = pygame.Surface((250, 250))
+    snakes = [make_snake(0, screen, cells_0, velocity_0), make_snake(1, screen, cells_1, velocity_1)]
+    state = State(snakes, (0, 0), screen)
+    for snake, move in zip(snakes, moves):
+        snake.move(move)
+    return state.simultaneous_game_over()
+
+
+def test_swap_is_head_to_head():
+    # Snake 0 en x=100 va à droite, snake 1 en x=125 va à gauche : les têtes échangent leurs cases
+    assert play([(2, 2), (3, 2), (4, 2)], (1, 0), [(7, 2), (6, 2), (5, 2)], (-1, 0), ['right', 'left']) == (True, "head_to_head", None)
+    assert play([(1, 2), (2, 2), (3, 2), (4, 2)], (1, 0), [(7, 2), (6, 2), (5, 2)], (-1, 0), ['right', 'left']) == (True, "head_to_head", 1)
+
+
+def test_same_cell_is_head_to_head():
+    assert play([(2, 2), (3, 2), (4, 2)], (1, 0), [(8, 2), (7, 2), (6, 2)], (-1, 0), ['right', 'left']) == (True, "head_to_head", None)
+    assert play([(2, 2), (3, 2), (4, 2)], (1, 0), [(9, 2), (8, 2), (7, 2), (6, 2)], (-1, 0), ['right', 'left']) == (True, "head_to_head", 0)
+
+
+def test_both_dead_is_a_draw():
+    assert play([(2, 0), (1, 0), (0, 0)], (-1, 0), [(7, 0), (8, 0), (9, 0)], (1, 0), ['left', 'right']) == (True, "wall", None)
+    assert play([(2, 0), (1, 0), (0, 0)], (-1, 0), [(5, 5), (5, 4), (5, 3)], (0, -1), ['left', 'up']) == (True, "wall", 0)
+
+
+def test_no_collision():
+    assert play([(2, 2), (3, 2), (4, 2)], (1, 0), [(2, 6), (3, 6), (4, 6)], (1, 0), ['right', 'right']) == (False, None, None)
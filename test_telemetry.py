@@ -0,0 +1,76 @@
+import math
+import random
+
+import pytest
+
+from telemetry import LatencyHistogram, Telemetry
+
+
+# Percentile exact, avec la même définition du rang que LatencyHistogram.percentile
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_percentiles_within_relative_error(seed):
+    rng = random.Random(seed)
+    # Des latences de quelques microsecondes à quelques secondes
+    values = [int(rng.lognormvariate(8, 2)) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.total == len(values)
+    assert histogram.max == max(values)
+    for q in (50, 95, 99):
+        expected = exact_percentile(values, q)
+        # 32 sous-tranches par puissance de 2 : le milieu d'une tranche est à moins de 1/32 de ses valeurs
+        assert abs(histogram.percentile(q) - expected) <= expected / 32 + 1
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(32):
+        histogram.record(value)
+    assert [histogram._value(histogram._index(value)) for value in range(32)] == list(range(32))
+    assert histogram.percentile(50) == exact_percentile(range(32), 50)
+
+
+def test_index_is_monotonic_and_value_in_bucket():
+    histogram = LatencyHistogram(max_value=1 << 20)
+    previous = 0
+    for value in range(1, 1 << 20, 7):
+        index = histogram._index(value)
+        assert previous <= index < len(histogram.counts)
+        previous = index
+        assert abs(histogram._value(index) - value) <= value / 32 + 1
+
+
+def test_values_are_clamped():
+    histogram = LatencyHistogram(max_value=1000)
+    histogram.record(-5)
+    histogram.record(10 ** 9)
+    assert histogram.max == 1000
+    assert histogram.percentile(100) == 1000
+    assert histogram.percentile(1) == 0
+
+
+def test_record_tick_counts_only_overruns():
+    # 10 fps : budget de 100 ms, les durées sont en nanosecondes
+    telemetry = Telemetry(10, verbose=False)
+    telemetry.start_game()
+    for duration in (50_000_000, 99_999_999, 100_000_000, 100_001_000, 250_000_000):
+        telemetry.record_tick(duration)
+    assert telemetry.overruns == 2
+    assert telemetry.summary()["tick"]["count"] == 5
+
+    telemetry.start_game()
+    assert telemetry.overruns == 0
+
+
+def test_no_budget_without_fps():
+    telemetry = Telemetry(0, verbose=False)
+    telemetry.record_tick(10 ** 12)
+    assert telemetry.overruns == 0
+    assert telemetry.summary()["budget_ms"] is None
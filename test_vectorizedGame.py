@@ -0,0 +1,103 @@
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import pytest
+
+from vectorizedGame import VectorizedGame
+
+GRID_SIZE = 25
+
+
+# Les deux implémentations tirent la nourriture au hasard : pour les comparer, on prend la première case libre
+def first_free_cell(occupied, cols, rows):
+    for y in range(rows):
+        for x in range(cols):
+            if (x, y) not in occupied:
+                return x, y
+    return 0, 0
+
+
+class DeterministicGame(VectorizedGame):
+    def generate_food(self, mask, occupied=None):
+        new_food = self.food.copy()
+        for i in np.flatnonzero(mask):
+            grid = self.occupancy[i].any(axis=0) if occupied is None else occupied[i]
+            cells = set((x, y) for y, x in zip(*np.nonzero(grid)))
+            new_food[i] = first_free_cell(cells, self.food_cols, self.food_rows)
+        return new_food
+
+
+def reference_food(state, game):
+    cells = set((x // GRID_SIZE, y // GRID_SIZE) for snake in state.snakes for x, y in zip(snake.posX, snake.posY))
+    x, y = first_free_cell(cells, game.food_cols, game.food_rows)
+    return x * GRID_SIZE, y * GRID_SIZE
+
+
+# Même enchaînement que GameWithAi.update_state, avec des coups imposés
+def reference_step(state, game, moves):
+    next_food = reference_food(state, game)
+    for i, snake in enumerate(state.snakes):
+        snake.move(moves[i])
+        if state.on_food(i):
+            state.update_food(next_food)
+            next_food = reference_food(state, game)
+    return state.game_over()
+
+
+def choose_moves(state, rng):
+    moves = []
+    for i, snake in enumerate(state.snakes):
+        possible = snake.getPossibleMoves(state)
+        if possible and rng.random() < 0.6:
+            # On va souvent vers la nourriture pour que les serpents mangent
+            head_x, head_y = snake.posX[snake.head], snake.posY[snake.head]
+            steps = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+            possible.sort(key=lambda m: abs(head_x + steps[m][0] * GRID_SIZE - state.food[0]) + abs(head_y + steps[m][1] * GRID_SIZE - state.food[1]))
+            moves.append(possible[0])
+        else:
+            moves.append(rng.choice([None, 'up', 'down', 'left', 'right']))
+    return moves
+
+
+@pytest.mark.parametrize("width, height", [(200, 150), (210, 160), (100, 75), (500, 450)])
+def test_step_matches_state(width, height):
+    pygame.init()
+    screen = pygame.Surface((width, height))
+    rng = random.Random(width * height)
+    game = DeterministicGame(60, width, height, GRID_SIZE, seed=width)
+    states = [game.to_state(i, screen) for i in range(game.num_games)]
+
+    for tick in range(120):
+        running = ~game.done
+        actions = np.full((game.num_games, game.num_snakes), -1)
+        expected = {}
+        for i in np.flatnonzero(running):
+            moves = choose_moves(states[i], rng)
+            actions[i] = [-1 if move is None else VectorizedGame.DIRECTIONS.index(move) for move in moves]
+            expected[i] = reference_step(states[i], game, moves)
+
+        done, cause, dead_id = game.step(actions)
+
+        for i, (is_over, expected_cause, expected_id) in expected.items():
+            state = game.to_state(i, screen)
+            assert state.food == states[i].food
+            for snake, expected_snake in zip(state.snakes, states[i].snakes):
+                assert snake.posX == expected_snake.posX
+                assert snake.posY == expected_snake.posY
+                assert snake.head == expected_snake.head
+                assert snake.taille == expected_snake.taille
+                assert (snake.vx, snake.vy) == (expected_snake.vx, expected_snake.vy)
+            assert bool(done[i]) == is_over
+            assert VectorizedGame.CAUSES[cause[i]] == expected_cause
+            assert (int(dead_id[i]) if done[i] else None) == expected_id
+
+        # On relance régulièrement les parties terminées
+        if tick % 20 == 19:
+            restarted = game.done.copy()
+            game.reset(restarted)
+            for i in np.flatnonzero(restarted):
+                states[i] = game.to_state(i, screen)
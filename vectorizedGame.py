@@ -0,0 +1,283 @@
+import numpy as np
+from state import State
+import snake
+
+
+class VectorizedGame():
+    """
+    La classe VectorizedGame simule N parties de serpent en parallèle. Au lieu d'un objet State et d'objets Snake par partie,
+    tous les plateaux sont stockés dans des tableaux NumPy et un seul appel à step() fait avancer toutes les parties d'un tour.
+    Utile pour les rollouts et les expériences sur les politiques, où une boucle Python par partie et par tour coûte trop cher.
+
+    Les règles reproduisent exactement celles de State et Snake : même buffer circulaire pour les positions (posX, posY, head),
+    même ordre de déplacement des serpents que GameWithAi.update_state, même logique que State.update_food
+    et même ordre de détection que State.game_over (mur, puis soi-même, puis l'autre serpent).
+    Les positions sont stockées en cases et non en pixels.
+
+    Attributs :
+        num_games (int) : Le nombre de parties simulées.
+        num_snakes (int) : Le nombre de serpents par partie.
+        grid_size (int) : La taille de la grille pour le jeu.
+        width (int) : La largeur du plateau en pixels.
+        height (int) : La hauteur du plateau en pixels.
+        cols (int) : Le nombre de colonnes du plateau.
+        rows (int) : Le nombre de lignes du plateau.
+        posX (np.ndarray) : Les positions x des serpents, de forme (num_games, num_snakes, capacité).
+        posY (np.ndarray) : Les positions y des serpents, de forme (num_games, num_snakes, capacité).
+        head (np.ndarray) : L'index de la tête de chaque serpent dans posX et posY, de forme (num_games, num_snakes).
+        vx (np.ndarray) : La vitesse de chaque serpent en x, de forme (num_games, num_snakes).
+        vy (np.ndarray) : La vitesse de chaque serpent en y, de forme (num_games, num_snakes).
+        taille (np.ndarray) : La taille de chaque serpent, de forme (num_games, num_snakes).
+        food (np.ndarray) : La position de la nourriture de chaque partie, de forme (num_games, 2).
+        occupancy (np.ndarray) : Le nombre de segments de chaque serpent sur chaque case, de forme (num_games, num_snakes, rows, cols).
+        done (np.ndarray) : Indique pour chaque partie si elle est terminée.
+        cause (np.ndarray) : La cause de la fin de chaque partie (index dans CAUSES).
+        dead_id (np.ndarray) : L'identifiant du serpent mort dans chaque partie (-1 si la partie continue).
+
+    Méthodes :
+        from_states(states, grid_size=25, seed=None) : Crée un VectorizedGame à partir d'une liste de State.
+        reset(mask=None) : Initialise une nouvelle partie pour les parties spécifiées, comme GameWithAi.initialize_game.
+        load_state(i, state) : Copie un State dans la partie i.
+        to_state(i, screen) : Reconstruit le State de la partie i.
+        step(actions) : Fait avancer toutes les parties en cours d'un tour.
+        generate_food(mask, occupied=None) : Génère une nouvelle position de nourriture libre pour les parties spécifiées.
+        game_over() : Vérifie quelles parties sont terminées.
+    """
+    DIRECTIONS = ('up', 'down', 'left', 'right')
+    CAUSES = (None, 'wall', 'self', 'other_snake')
+    # (vx, vy) pour chaque direction de DIRECTIONS, comme dans Snake.move
+    VELOCITIES = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)])
+
+    def __init__(self, num_games, width, height, grid_size=25, num_snakes=2, seed=None):
+        self.num_games = num_games
+        self.num_snakes = num_snakes
+        self.grid_size = grid_size
+        self.width = width
+        self.height = height
+        # Un serpent meurt dès que x >= width, donc on arrondit au supérieur pour les murs.
+        # La nourriture, elle, est générée comme dans State.generate_food (arrondi à l'inférieur).
+        self.cols = -(-width // grid_size)
+        self.rows = -(-height // grid_size)
+        self.food_cols = width // grid_size
+        self.food_rows = height // grid_size
+        self.rng = np.random.default_rng(seed)
+
+        capacity = self.cols * self.rows + 3
+        self.posX = np.zeros((num_games, num_snakes, capacity), dtype=np.int64)
+        self.posY = np.zeros((num_games, num_snakes, capacity), dtype=np.int64)
+        self.head = np.zeros((num_games, num_snakes), dtype=np.int64)
+        self.vx = np.zeros((num_games, num_snakes), dtype=np.int64)
+        self.vy = np.zeros((num_games, num_snakes), dtype=np.int64)
+        self.taille = np.zeros((num_games, num_snakes), dtype=np.int64)
+        self.food = np.zeros((num_games, 2), dtype=np.int64)
+        self.occupancy = np.zeros((num_games, num_snakes, self.rows, self.cols), dtype=np.int32)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.cause = np.zeros(num_games, dtype=np.int8)
+        self.dead_id = np.full(num_games, -1, dtype=np.int64)
+        self.reset()
+
+    @classmethod
+    def from_states(cls, states, grid_size=25, seed=None):
+        screen = states[0].screen
+        game = cls(len(states), screen.get_width(), screen.get_height(), grid_size, len(states[0].snakes), seed)
+        for i, state in enumerate(states):
+            game.load_state(i, state)
+        return game
+
+    def reset(self, mask=None):
+        games = np.arange(self.num_games) if mask is None else np.flatnonzero(mask)
+        n = len(games)
+        if n == 0:
+            return
+        self.food[games, 0] = self.rng.integers(0, self.food_cols, n)
+        self.food[games, 1] = self.rng.integers(0, self.food_rows, n)
+        self.occupancy[games] = 0
+        for s in range(self.num_snakes):
+            x = self.rng.integers(0, self.food_cols, n)
+            y = self.rng.integers(0, self.food_rows, n)
+            # On vérifie que le serpent n'est pas sur la nourriture, sinon on génère une nouvelle position
+            on_food = (x == self.food[games, 0]) & (y == self.food[games, 1])
+            while on_food.any():
+                x[on_food] = self.rng.integers(0, self.food_cols, on_food.sum())
+                y[on_food] = self.rng.integers(0, self.food_rows, on_food.sum())
+                on_food = (x == self.food[games, 0]) & (y == self.food[games, 1])
+            # Même placement initial que le constructeur de Snake
+            horizontal = self.rng.random(n) < 0.5
+            offsets = np.arange(3)
+            self.posX[games, s, :3] = np.where(horizontal[:, None], x[:, None] - offsets, x[:, None])
+            self.posY[games, s, :3] = np.where(horizontal[:, None], y[:, None], y[:, None] - offsets)
+            self.head[games, s] = 0
+            self.vx[games, s] = 0
+            self.vy[games, s] = 0
+            self.taille[games, s] = 3
+            for i in range(3):
+                self._occupy(games, s, self.posX[games, s, i], self.posY[games, s, i], 1)
+        self.done[games] = False
+        self.cause[games] = 0
+        self.dead_id[games] = -1
+
+    def load_state(self, i, state):
+        grid_size = self.grid_size
+        self._ensure_capacity(max(snake.taille for snake in state.snakes))
+        self.occupancy[i] = 0
+        for s, snake in enumerate(state.snakes):
+            games = np.full(snake.taille, i)
+            self.posX[i, s, :snake.taille] = [x // grid_size for x in snake.posX]
+            self.posY[i, s, :snake.taille] = [y // grid_size for y in snake.posY]
+            self.head[i, s] = snake.head
+            self.vx[i, s] = snake.vx
+            self.vy[i, s] = snake.vy
+            self.taille[i, s] = snake.taille
+            self._occupy(games, s, self.posX[i, s, :snake.taille], self.posY[i, s, :snake.taille], 1)
+        self.food[i] = (state.food[0] // grid_size, state.food[1] // grid_size)
+        self.done[i] = False
+        self.cause[i] = 0
+        self.dead_id[i] = -1
+
+    def to_state(self, i, screen):
+        grid_size = self.grid_size
+        snakes = []
+        for s in range(self.num_snakes):
+            new_snake = snake.Snake(s, screen, grid_size)
+            taille = int(self.taille[i, s])
+            new_snake.posX = (self.posX[i, s, :taille] * grid_size).tolist()
+            new_snake.posY = (self.posY[i, s, :taille] * grid_size).tolist()
+            new_snake.head = int(self.head[i, s])
+            new_snake.vx = int(self.vx[i, s])
+            new_snake.vy = int(self.vy[i, s])
+            new_snake.taille = taille
+            snakes.append(new_snake)
+        food = (int(self.food[i, 0]) * grid_size, int(self.food[i, 1]) * grid_size)
+        return State(snakes, food, screen)
+
+    # actions est un tableau (num_games, num_snakes) d'indices dans DIRECTIONS.
+    # -1 correspond à Snake.move(None) : le serpent garde sa direction actuelle.
+    # Les serpents sont déplacés les uns après les autres, comme dans GameWithAi.update_state,
+    # et les parties déjà terminées ne sont plus modifiées.
+    def step(self, actions):
+        actions = np.asarray(actions).reshape(self.num_games, self.num_snakes)
+        active = ~self.done
+        # La prochaine nourriture est tirée parmi les cases libres avant les déplacements, comme dans GameWithAi.update_state.
+        # On ne garde que le masque des cases occupées : le tirage n'est fait que pour les parties où un serpent mange.
+        occupied = self.occupancy.any(axis=1)
+        next_food = self.food.copy()
+        drawn = np.zeros(self.num_games, dtype=bool)
+        for s in range(self.num_snakes):
+            self._move(s, actions[:, s], active)
+            head_x, head_y = self._head_position(s)
+            eats = active & (head_x == self.food[:, 0]) & (head_y == self.food[:, 1])
+            if eats.any():
+                first = eats & ~drawn
+                next_food[first] = self.generate_food(first, occupied)[first]
+                self._update_food(eats, next_food)
+                next_food[eats] = self.generate_food(eats)[eats]
+                drawn |= eats
+        self.game_over(active)
+        return self.done.copy(), self.cause.copy(), self.dead_id.copy()
+
+    # On tire une valeur aléatoire pour chaque case libre et on garde la plus grande :
+    # c'est un tirage uniforme parmi les cases qui ne sont occupées par aucun serpent, comme State.generate_food.
+    # occupied (num_games, rows, cols) permet de tirer sur une occupation passée, sinon on prend l'occupation actuelle.
+    def generate_food(self, mask, occupied=None):
+        new_food = self.food.copy()
+        games = np.flatnonzero(mask)
+        if len(games) == 0:
+            return new_food
+        if occupied is None:
+            occupied = self.occupancy[games].any(axis=1)
+        else:
+            occupied = occupied[games]
+        occupied = occupied[:, :self.food_rows, :self.food_cols]
+        scores = self.rng.random(occupied.shape)
+        scores[occupied] = -1
+        cells = scores.reshape(len(games), -1).argmax(axis=1)
+        new_food[games, 0] = cells % self.food_cols
+        new_food[games, 1] = cells // self.food_cols
+        return new_food
+
+    # Même ordre de vérification que State.game_over puis Snake.is_dead : le premier serpent mort l'emporte
+    def game_over(self, active=None):
+        undecided = ~self.done if active is None else active.copy()
+        games = np.arange(self.num_games)
+        for s in range(self.num_snakes):
+            head_x, head_y = self._head_position(s)
+            wall = (head_x < 0) | (head_y < 0) | (head_x >= self.cols) | (head_y >= self.rows)
+            x = np.clip(head_x, 0, self.cols - 1)
+            y = np.clip(head_y, 0, self.rows - 1)
+            cell = self.occupancy[games, :, y, x]
+
+            # State.is_self_collision parcourt les indices 0..taille-2 sauf la tête :
+            # on retire donc la tête et, s'il est ailleurs, le dernier index du buffer.
+            last = self.taille[:, s] - 1
+            last_on_head = (last != self.head[:, s]) & (self.posX[games, s, last] == head_x) & (self.posY[games, s, last] == head_y)
+            self_hit = ~wall & (cell[:, s] - 1 - last_on_head > 0)
+            other_hit = ~wall & ~self_hit & (cell.sum(axis=1) - cell[:, s] > 0)
+
+            cause = np.where(wall, 1, np.where(self_hit, 2, np.where(other_hit, 3, 0)))
+            dead = undecided & (cause > 0)
+            self.done[dead] = True
+            self.cause[dead] = cause[dead]
+            self.dead_id[dead] = s
+            undecided &= ~dead
+        return self.done, self.cause, self.dead_id
+
+    def _head_position(self, s):
+        games = np.arange(self.num_games)
+        head = self.head[:, s]
+        return self.posX[games, s, head], self.posY[games, s, head]
+
+    # Équivalent vectorisé de Snake.move : directionSnake puis moveSnake
+    def _move(self, s, directions, active):
+        games = np.flatnonzero(active & (directions >= 0))
+        dx = self.VELOCITIES[directions[games], 0]
+        dy = self.VELOCITIES[directions[games], 1]
+        allowed = (self.vx[games, s] != -dx) | (self.vy[games, s] != -dy)
+        self.vx[games[allowed], s] = dx[allowed]
+        self.vy[games[allowed], s] = dy[allowed]
+
+        games = np.flatnonzero(active & ((self.vx[:, s] != 0) | (self.vy[:, s] != 0)))
+        head = self.head[games, s]
+        new_head = (head + 1) % self.taille[games, s]
+        # La case écrasée dans le buffer circulaire est libérée
+        self._occupy(games, s, self.posX[games, s, new_head], self.posY[games, s, new_head], -1)
+        x = self.posX[games, s, head] + self.vx[games, s]
+        y = self.posY[games, s, head] + self.vy[games, s]
+        self.posX[games, s, new_head] = x
+        self.posY[games, s, new_head] = y
+        self._occupy(games, s, x, y, 1)
+        self.head[games, s] = new_head
+
+    # Équivalent vectorisé de State.update_food : chaque serpent sur la nourriture grandit,
+    # et la nourriture est remplacée dès qu'un serpent la mange
+    def _update_food(self, mask, next_food):
+        for s in range(self.num_snakes):
+            head_x, head_y = self._head_position(s)
+            on_food = mask & (head_x == self.food[:, 0]) & (head_y == self.food[:, 1])
+            self._extend(s, on_food)
+            self.food[on_food] = next_food[on_food]
+
+    # Équivalent vectorisé de Snake.extend
+    def _extend(self, s, mask):
+        games = np.flatnonzero(mask)
+        if len(games) == 0:
+            return
+        taille = self.taille[games, s]
+        self._ensure_capacity(taille.max() + 1)
+        self.posX[games, s, taille] = self.posX[games, s, taille - 1]
+        self.posY[games, s, taille] = self.posY[games, s, taille - 1]
+        self._occupy(games, s, self.posX[games, s, taille], self.posY[games, s, taille], 1)
+        self.taille[games, s] = taille + 1
+
+    def _ensure_capacity(self, taille):
+        capacity = self.posX.shape[2]
+        if taille <= capacity:
+            return
+        extra = max(taille, 2 * capacity) - capacity
+        padding = np.zeros((self.num_games, self.num_snakes, extra), dtype=self.posX.dtype)
+        self.posX = np.concatenate((self.posX, padding), axis=2)
+        self.posY = np.concatenate((self.posY, padding), axis=2)
+
+    # Les segments hors du plateau (placement initial contre un mur, tête dans le mur) ne sont pas comptés
+    def _occupy(self, games, s, x, y, delta):
+        inside = (x >= 0) & (y >= 0) & (x < self.cols) & (y < self.rows)
+        np.add.at(self.occupancy, (games[inside], s, y[inside], x[inside]), delta)